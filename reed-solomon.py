@@ -8,13 +8,29 @@ erasure correction (known error locations).
 Based on Bert Hubert's "Practical Reed–Solomon for Programmers".
 """
 
+import os
 import sys
-import random
-from reedsolo import RSCodec, ReedSolomonError
+import time
+import argparse
+import functools
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from rs_backend import RSCodec, ReedSolomonError, RELEASES_GIL, encode_many, decode_many
 
-def hexify(b: bytes) -> str:
-    """Return a hex string, grouping two hex digits per byte."""
-    return b.hex()
+rng = np.random.default_rng()
+out = sys.stdout.buffer
+
+DEFAULT_MSG = "This is a test of the reed-solomon code"
+DEFAULT_NSYM = 8
+
+# Status marks, UTF-8 encoded once rather than on every subsection
+OK_MARK = "✓".encode()
+FAIL_MARK = "✗".encode()
+
+@functools.lru_cache(maxsize=16)
+def _get_codec(nsym: int) -> RSCodec:
+    """Return a codec for nsym parity bytes, building its generator polynomial only once."""
+    return RSCodec(nsym)
 
 def print_section(title: str, width: int = 60):
     """Print a formatted section header."""
@@ -22,31 +38,35 @@ def print_section(title: str, width: int = 60):
     print(f"{title:^{width}}")
     print("=" * width)
 
-def print_subsection(title: str):
-    """Print a formatted subsection header."""
-    print(f"\n{'-' * 40}")
-    print(f"{title}")
-    print(f"{'-' * 40}")
+def print_subsection(title: str, buf: list):
+    """Write a formatted subsection header and its body lines (bytes) in one call."""
+    rule = b"-" * 40
+    sys.stdout.flush()  # keep ordering with text already written through print()/input()
+    out.write(b"\n" + rule + b"\n" + title.encode() + b"\n" + rule + b"\n" + b"".join(buf))
 
-def get_user_input(prompt: str, default: str = None) -> str:
-    """Get user input with a default value."""
+def get_user_input(prompt: str, default: str = None, value=None) -> str:
+    """Get user input with a default value, unless a value was already given on the command line."""
+    if value is not None:
+        return str(value)
     if default:
         user_input = input(f"{prompt} [{default}]: ").strip()
         return user_input if user_input else default
     return input(f"{prompt}: ").strip()
 
-def demo_simple_message():
+def demo_simple_message(args):
     print_section("REED-SOLOMON ERROR CORRECTION DEMO")
     
     # 1) Get user input for message
-    default_msg = "This is a test of the reed-solomon code"
-    msg = get_user_input("Enter your message", default_msg).encode()
+    # An empty --msg means the default message, as with an empty answer at the prompt
+    msg_arg = DEFAULT_MSG if args.msg == "" else args.msg
+    msg = get_user_input("Enter your message", DEFAULT_MSG, msg_arg).encode()
     
     # 2) Get user input for number of parity bytes
-    default_nsym = 8
+    nsym_arg = args.nsym
     while True:
         try:
-            nsym = int(get_user_input("Enter number of parity bytes (must be even)", str(default_nsym)))
+            nsym = int(get_user_input("Enter number of parity bytes (must be even)", str(DEFAULT_NSYM), nsym_arg))
+            nsym_arg = None  # an invalid command-line value falls back to prompting
             if nsym % 2 != 0:
                 print("Error: Number of parity bytes must be even")
                 continue
@@ -54,29 +74,35 @@ def demo_simple_message():
         except ValueError:
             print("Error: Please enter a valid number")
     
-    rsc = RSCodec(nsym)
-    print_subsection("Original Message")
-    print(f"Message: {msg.decode()}")
-    print(f"Length: {len(msg)} bytes")
-    print(f"Hex: {hexify(msg)}")
-    
-    print_subsection("Encoding Parameters")
-    print(f"Number of parity bytes (nsym): {nsym}")
-    print(f"Maximum correctable errors: {nsym//2}")
+    rsc = _get_codec(nsym)
+    buf = []
+    buf.append(b"Message: " + msg + b"\n")
+    buf.append(f"Length: {len(msg)} bytes\n".encode())
+    buf.append(b"Hex: " + msg.hex().encode("ascii") + b"\n")
+    print_subsection("Original Message", buf)
+
+    buf = []
+    buf.append(f"Number of parity bytes (nsym): {nsym}\n".encode())
+    buf.append(f"Maximum correctable errors: {nsym//2}\n".encode())
+    print_subsection("Encoding Parameters", buf)
 
     # 3) Encode the message
     codeword = rsc.encode(msg)
-    data, parity = codeword[:-nsym], codeword[-nsym:]
-    print_subsection("Encoded Message")
-    print(f"Total codeword length: {len(codeword)} bytes")
-    print(f"Data bytes ({len(data)}): {hexify(data)}")
-    print(f"Parity bytes ({len(parity)}): {hexify(parity)}")
+    mv = memoryview(codeword)
+    data, parity = mv[:-nsym], mv[-nsym:]
+    buf = []
+    buf.append(f"Total codeword length: {len(codeword)} bytes\n".encode())
+    buf.append(f"Data bytes ({len(data)}): ".encode() + data.hex().encode("ascii") + b"\n")
+    buf.append(f"Parity bytes ({len(parity)}): ".encode() + parity.hex().encode("ascii") + b"\n")
+    print_subsection("Encoded Message", buf)
 
     # 4) Simulate errors
     max_errors = nsym // 2
+    errors_arg = args.errors
     while True:
         try:
-            num_errors = int(get_user_input(f"Enter number of errors to simulate (1-{max_errors})", str(max_errors//2)))
+            num_errors = int(get_user_input(f"Enter number of errors to simulate (1-{max_errors})", str(max_errors//2), errors_arg))
+            errors_arg = None
             if num_errors < 1 or num_errors > max_errors:
                 print(f"Error: Number of errors must be between 1 and {max_errors}")
                 continue
@@ -85,32 +111,37 @@ def demo_simple_message():
             print("Error: Please enter a valid number")
 
     # Generate random error positions
-    error_positions = sorted(random.sample(range(len(codeword)), num_errors))
-    corrupted = bytearray(codeword)
-    for pos in error_positions:
-        corrupted[pos] ^= 0xFF  # flip all bits at these positions
+    error_positions = np.sort(rng.choice(len(codeword), num_errors, replace=False))
+    # One working copy of the codeword serves both simulations: corrupt it
+    # in place, decode, then flip the same bytes back.
+    arr = np.frombuffer(codeword, np.uint8).copy()
+    arr[error_positions] ^= np.uint8(0xFF)  # flip all bits at these positions
     
-    print_subsection("Error Simulation")
-    print(f"Corrupted positions: {error_positions}")
-    print(f"Corrupted codeword: {hexify(bytes(corrupted))}")
+    buf = []
+    buf.append(f"Corrupted positions: {error_positions.tolist()}\n".encode())
+    buf.append(b"Corrupted codeword: " + arr.data.hex().encode("ascii") + b"\n")
+    print_subsection("Error Simulation", buf)
 
     # 5) Decode with error correction
-    print_subsection("Error Correction")
+    buf = []
     try:
-        decoded_msg, num_errors, err_pos = rsc.decode(bytes(corrupted))
-        print("✓ Decoding successful!")
-        print(f"Number of errors corrected: {num_errors}")
-        print(f"Error positions: {err_pos}")
-        print(f"Recovered message: {decoded_msg.decode()}")
-        print(f"Recovered hex: {hexify(decoded_msg)}")
+        decoded_msg, num_errors, err_pos = rsc.decode(arr.data)
+        buf.append(OK_MARK + b" Decoding successful!\n")
+        buf.append(f"Number of errors corrected: {num_errors}\n".encode())
+        buf.append(f"Error positions: {err_pos}\n".encode())
+        buf.append(b"Recovered message: " + decoded_msg + b"\n")
+        buf.append(b"Recovered hex: " + decoded_msg.hex().encode("ascii") + b"\n")
     except ReedSolomonError as e:
-        print("✗ Decoding failed!")
-        print(f"Error: {e}")
+        buf.append(FAIL_MARK + b" Decoding failed!\n")
+        buf.append(f"Error: {e}\n".encode())
+    print_subsection("Error Correction", buf)
 
     # 6) Simulate erasures
+    erasures_arg = args.erasures
     while True:
         try:
-            num_erasures = int(get_user_input(f"Enter number of erasures to simulate (1-{nsym})", str(nsym//2)))
+            num_erasures = int(get_user_input(f"Enter number of erasures to simulate (1-{nsym})", str(nsym//2), erasures_arg))
+            erasures_arg = None
             if num_erasures < 1 or num_erasures > nsym:
                 print(f"Error: Number of erasures must be between 1 and {nsym}")
                 continue
@@ -119,27 +150,114 @@ def demo_simple_message():
             print("Error: Please enter a valid number")
 
     # Generate random erasure positions
-    erasure_positions = sorted(random.sample(range(len(codeword)), num_erasures))
-    corrupted2 = bytearray(codeword)
-    for pos in erasure_positions:
-        corrupted2[pos] ^= 0xFF
+    erasure_positions = np.sort(rng.choice(len(codeword), num_erasures, replace=False))
+    arr[error_positions] ^= np.uint8(0xFF)  # restore the codeword
+    arr[erasure_positions] ^= np.uint8(0xFF)
     
-    print_subsection("Erasure Simulation")
-    print(f"Erasure positions: {erasure_positions}")
-    print(f"Corrupted codeword: {hexify(bytes(corrupted2))}")
+    buf = []
+    buf.append(f"Erasure positions: {erasure_positions.tolist()}\n".encode())
+    buf.append(b"Corrupted codeword: " + arr.data.hex().encode("ascii") + b"\n")
+    print_subsection("Erasure Simulation", buf)
 
     # 7) Decode with erasure correction
-    print_subsection("Erasure Correction")
+    buf = []
     try:
-        decoded_msg2, num_errors2, err_pos2 = rsc.decode(bytes(corrupted2), erase_pos=erasure_positions)
-        print("✓ Decoding with erasures successful!")
-        print(f"Number of errors corrected: {num_errors2}")
-        print(f"Error positions: {err_pos2}")
-        print(f"Recovered message: {decoded_msg2.decode()}")
-        print(f"Recovered hex: {hexify(decoded_msg2)}")
+        decoded_msg2, num_errors2, err_pos2 = rsc.decode(arr.data, erase_pos=erasure_positions.tolist())
+        buf.append(OK_MARK + b" Decoding with erasures successful!\n")
+        buf.append(f"Number of errors corrected: {num_errors2}\n".encode())
+        buf.append(f"Error positions: {err_pos2}\n".encode())
+        buf.append(b"Recovered message: " + decoded_msg2 + b"\n")
+        buf.append(b"Recovered hex: " + decoded_msg2.hex().encode("ascii") + b"\n")
     except ReedSolomonError as e:
-        print("✗ Decoding with erasures failed!")
-        print(f"Error: {e}")
+        buf.append(FAIL_MARK + b" Decoding with erasures failed!\n")
+        buf.append(f"Error: {e}\n".encode())
+    print_subsection("Erasure Correction", buf)
+
+    # 8) Optionally push many copies through the batch encode/decode path
+    repeat = args.repeat
+    if repeat > 0:
+        buf = []
+        t0 = time.perf_counter()
+        codewords = encode_many(rsc, [msg] * repeat)
+        t1 = time.perf_counter()
+        batch = np.frombuffer(b"".join(codewords), np.uint8).reshape(repeat, len(codeword)).copy()
+        batch[:, error_positions] ^= np.uint8(0xFF)
+        t2 = time.perf_counter()
+        try:
+            results = decode_many(rsc, [row.data for row in batch])
+            t3 = time.perf_counter()
+            recovered = sum(dec == msg for dec, _, _ in results)
+            buf.append(f"Codewords: {repeat} x {len(codeword)} bytes\n".encode())
+            buf.append(f"Encode: {(t1 - t0) * 1e3:.2f} ms ({repeat / (t1 - t0):.0f} codewords/s)\n".encode())
+            buf.append(f"Decode: {(t3 - t2) * 1e3:.2f} ms ({repeat / (t3 - t2):.0f} codewords/s)\n".encode())
+            buf.append(f"Recovered messages: {recovered}/{repeat}\n".encode())
+        except ReedSolomonError as e:
+            buf.append(FAIL_MARK + b" Batch decoding failed!\n")
+            buf.append(f"Error: {e}\n".encode())
+        print_subsection("Batch Encode/Decode", buf)
+
+def _bench_rounds(rsc, msg: bytes, error_positions, erasure_positions, rounds: int):
+    """Run rounds of encode + error decode + erasure decode, with no output."""
+    erase_pos = erasure_positions.tolist()
+    for _ in range(rounds):
+        arr = np.frombuffer(rsc.encode(msg), np.uint8).copy()
+        arr[error_positions] ^= np.uint8(0xFF)
+        rsc.decode(arr.data)
+        arr[error_positions] ^= np.uint8(0xFF)
+        arr[erasure_positions] ^= np.uint8(0xFF)
+        rsc.decode(arr.data, erase_pos=erase_pos)
+
+def run_bench(args):
+    """Non-interactive benchmark: encode and decode args.bench times with no per-iteration output."""
+    msg = (args.msg or DEFAULT_MSG).encode()
+    nsym = DEFAULT_NSYM if args.nsym is None else args.nsym
+    num_errors = max(1, nsym // 4) if args.errors is None else args.errors
+    num_erasures = nsym // 2 if args.erasures is None else args.erasures
+    if nsym < 2 or nsym % 2 != 0:
+        sys.exit("Error: Number of parity bytes must be even")
+    if nsym >= 255:
+        sys.exit("Error: Number of parity bytes must be less than 255")
+    if num_errors < 1 or num_errors > nsym // 2:
+        sys.exit(f"Error: Number of errors must be between 1 and {nsym // 2}")
+    if num_erasures < 1 or num_erasures > nsym:
+        sys.exit(f"Error: Number of erasures must be between 1 and {nsym}")
+
+    rsc = _get_codec(nsym)
+    n = len(rsc.encode(msg))
+    error_positions = np.sort(rng.choice(n, num_errors, replace=False))
+    erasure_positions = np.sort(rng.choice(n, num_erasures, replace=False))
+
+    # Rounds are independent, so split them across threads -- but only when
+    # the codec releases the GIL; otherwise threads would just take turns.
+    workers = min(os.cpu_count() or 1, args.bench) if RELEASES_GIL else 1
+    share, extra = divmod(args.bench, workers)
+    rounds = [share + (i < extra) for i in range(workers)]
+
+    t0 = time.perf_counter()
+    if workers == 1:
+        _bench_rounds(rsc, msg, error_positions, erasure_positions, args.bench)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            list(ex.map(lambda r: _bench_rounds(rsc, msg, error_positions, erasure_positions, r), rounds))
+    elapsed = time.perf_counter() - t0
+    print(f"{args.bench} x (encode + error decode + erasure decode) of {n} bytes, nsym={nsym}, "
+          f"{workers} thread(s): {elapsed:.3f} s ({args.bench / elapsed:.0f} runs/s)")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Reed-Solomon error correction demo")
+    parser.add_argument("--msg", help="message to encode (skips the prompt; empty means the default message)")
+    parser.add_argument("--nsym", type=int, help="number of parity bytes, must be even (skips the prompt)")
+    parser.add_argument("--errors", type=int, help="number of errors to simulate (skips the prompt)")
+    parser.add_argument("--erasures", type=int, help="number of erasures to simulate (skips the prompt)")
+    parser.add_argument("--repeat", type=int, default=0, metavar="N",
+                        help="also encode/decode N copies of the message through the batch path")
+    parser.add_argument("--bench", type=int, default=0, metavar="N",
+                        help="run N encode/decode rounds non-interactively and only report the timing")
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    demo_simple_message()
+    args = parse_args()
+    if args.bench > 0:
+        run_bench(args)
+    else:
+        demo_simple_message(args)
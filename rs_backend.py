@@ -0,0 +1,49 @@
+"""
+rs_backend.py
+
+Picks the fastest Reed–Solomon codec available at import time.
+
+Every backend exposes the reedsolo API (``RSCodec`` and
+``ReedSolomonError``), so the demo does not care which one it gets:
+
+1. numba     - rs_numba, JIT-compiled GF(2^8) kernels (needs numba)
+2. creedsolo - the Cython build of reedsolo (compiled GF(2^8) loops)
+3. reedsolo  - the pure-Python reference implementation, with the
+                syndrome computation and encoder sped up by rs_patch
+"""
+
+# Whether the codec's kernels run without holding the GIL, i.e. whether
+# encoding/decoding from several threads can actually run in parallel.
+RELEASES_GIL = False
+
+try:
+    from rs_numba import RSCodec, ReedSolomonError
+    BACKEND = "numba"
+    RELEASES_GIL = True
+except ImportError:
+    try:
+        from creedsolo import RSCodec, ReedSolomonError
+        BACKEND = "creedsolo"
+    except ImportError:
+        import rs_patch
+        from reedsolo import RSCodec, ReedSolomonError
+        rs_patch.install()
+        BACKEND = "reedsolo"
+
+__all__ = ["RSCodec", "ReedSolomonError", "BACKEND", "RELEASES_GIL", "encode_many", "decode_many"]
+
+
+def encode_many(rsc, msgs):
+    """Encode a list of messages, using the codec's batch kernel when it has one."""
+    batch = getattr(rsc, "encode_many", None)
+    if batch is not None:
+        return batch(msgs)
+    return [rsc.encode(msg) for msg in msgs]
+
+
+def decode_many(rsc, cws):
+    """Decode a list of codewords, using the codec's batch kernel when it has one."""
+    batch = getattr(rsc, "decode_many", None)
+    if batch is not None:
+        return batch(cws)
+    return [rsc.decode(cw) for cw in cws]
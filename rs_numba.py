@@ -0,0 +1,451 @@
+"""
+rs_numba.py
+
+Numba-compiled Reed–Solomon codec over GF(2^8).
+
+Uses the same field and code parameters as reedsolo's defaults
+(primitive polynomial 0x11d, generator 2, first consecutive root 0),
+so codewords are interchangeable with ``reedsolo.RSCodec``.
+
+The kernels work on ``np.uint8`` arrays and write into preallocated
+outputs; ``RSCodec`` wraps them behind the reedsolo API, including
+chunking of messages longer than one 255-byte block. ``encode_many`` /
+``decode_many`` run a whole batch of blocks through one parallel kernel
+call instead of crossing the Python/JIT boundary once per block.
+All kernels are compiled with nogil=True, so codecs can be driven from
+several threads at once.
+"""
+
+import numpy as np
+from numba import njit, prange
+from reedsolo import ReedSolomonError
+
+PRIM = 0x11d
+FIELD_CHARAC = 255
+
+# Antilog table is doubled so exp[log[a] + log[b]] never needs a modulo.
+GF_EXP = np.empty(512, np.uint8)
+GF_LOG = np.zeros(256, np.uint8)
+
+
+def _init_tables():
+    """Fill GF_EXP / GF_LOG for GF(2^8) with primitive polynomial PRIM."""
+    x = 1
+    for i in range(FIELD_CHARAC):
+        GF_EXP[i] = x
+        GF_LOG[x] = i
+        x <<= 1
+        if x & 0x100:
+            x ^= PRIM
+    GF_EXP[FIELD_CHARAC:] = GF_EXP[:512 - FIELD_CHARAC]
+
+
+_init_tables()
+
+# Failure codes returned by rs_decode_block
+_TOO_MANY_ERASURES = -1
+_TOO_MANY_ERRORS = -2
+_CANNOT_LOCATE = -3
+_CANNOT_CORRECT = -4
+
+_FAILURES = {
+    _TOO_MANY_ERASURES: "Too many erasures to correct",
+    _TOO_MANY_ERRORS: "Too many errors to correct",
+    _CANNOT_LOCATE: "Could not locate error",
+    _CANNOT_CORRECT: "Could not correct message",
+}
+
+
+@njit(cache=True, nogil=True)
+def gf_mul(a, b):
+    if a == 0 or b == 0:
+        return 0
+    return GF_EXP[np.int64(GF_LOG[a]) + np.int64(GF_LOG[b])]
+
+
+@njit(cache=True, nogil=True)
+def gf_inv(a):
+    return GF_EXP[FIELD_CHARAC - np.int64(GF_LOG[a])]
+
+
+@njit(cache=True, nogil=True)
+def gf_pow_alpha(e):
+    """Return alpha**e for any (possibly negative) integer exponent."""
+    return GF_EXP[e % FIELD_CHARAC]
+
+
+@njit(cache=True, nogil=True)
+def rs_generator_poly(nsym):
+    """Generator polynomial prod(x - alpha**i), highest degree first."""
+    gen = np.zeros(nsym + 1, np.uint8)
+    gen[0] = 1
+    for i in range(nsym):
+        root = gf_pow_alpha(i)
+        # Multiply in place by (x + root), walking from the low end up
+        for j in range(i + 1, 0, -1):
+            gen[j] ^= gf_mul(gen[j - 1], root)
+    return gen
+
+
+# Generator polynomials by nsym, shared by every codec and encode call
+_GEN_CACHE = {}
+
+
+def generator_poly(nsym):
+    """Return the (cached) generator polynomial for nsym parity bytes."""
+    gen = _GEN_CACHE.get(nsym)
+    if gen is None:
+        gen = _GEN_CACHE[nsym] = rs_generator_poly(nsym)
+    return gen
+
+
+@njit(cache=True, nogil=True)
+def rs_encode(msg, gen):
+    """Systematic encode of one block: msg followed by len(gen) - 1 parity bytes."""
+    nsym = gen.shape[0] - 1
+    n = msg.shape[0]
+    out = np.zeros(n + nsym, np.uint8)
+    out[:n] = msg
+    # Extended synthetic division (Horner's rule on the running remainder)
+    for i in range(n):
+        coef = out[i]
+        if coef != 0:
+            lcoef = np.int64(GF_LOG[coef])
+            for j in range(1, nsym + 1):
+                out[i + j] ^= GF_EXP[lcoef + np.int64(GF_LOG[gen[j]])]
+    out[:n] = msg
+    return out
+
+
+@njit(cache=True, nogil=True)
+def syndromes(cw, nsym, synd):
+    """synd[i] = cw(alpha**i) for i in range(nsym); returns True if any is non-zero."""
+    nonzero = False
+    for i in range(nsym):
+        x = gf_pow_alpha(i)
+        acc = 0
+        for j in range(cw.shape[0]):
+            acc = gf_mul(acc, x) ^ cw[j]
+        synd[i] = acc
+        if acc != 0:
+            nonzero = True
+    return nonzero
+
+
+@njit(cache=True, nogil=True)
+def forney_syndromes(synd, coef_pos, nsym, fsynd):
+    """Fold the known erasure locations out of the syndromes."""
+    fsynd[:nsym] = synd[:nsym]
+    for k in range(coef_pos.shape[0]):
+        x = gf_pow_alpha(coef_pos[k])
+        for j in range(nsym - 1):
+            fsynd[j] = gf_mul(fsynd[j], x) ^ fsynd[j + 1]
+
+
+@njit(cache=True, nogil=True)
+def berlekamp_massey(synd, nsteps, err_loc):
+    """Error locator (lowest degree first) from nsteps syndromes; returns its degree."""
+    size = err_loc.shape[0]
+    prev = np.zeros(size, np.uint8)
+    tmp = np.zeros(size, np.uint8)
+    err_loc[:] = 0
+    err_loc[0] = 1
+    prev[0] = 1
+    degree = 0
+    shift = 1
+    prev_delta = 1
+    for k in range(nsteps):
+        delta = synd[k]
+        for i in range(1, degree + 1):
+            delta ^= gf_mul(err_loc[i], synd[k - i])
+        if delta == 0:
+            shift += 1
+            continue
+        scale = gf_mul(delta, gf_inv(prev_delta))
+        if 2 * degree <= k:
+            tmp[:] = err_loc
+            for i in range(size - shift):
+                err_loc[i + shift] ^= gf_mul(scale, prev[i])
+            degree = k + 1 - degree
+            prev[:] = tmp
+            prev_delta = delta
+            shift = 1
+        else:
+            for i in range(size - shift):
+                err_loc[i + shift] ^= gf_mul(scale, prev[i])
+            shift += 1
+    return degree
+
+
+@njit(cache=True, nogil=True)
+def chien_search(err_loc, degree, n, coef_pos, start):
+    """Append the coefficient degrees of the locator's roots to coef_pos[start:]."""
+    # Keep log(err_loc[i] * alpha**(-i*c)) per non-zero term and step it by
+    # -i each position, so every evaluation is just table lookups and XORs.
+    terms = np.empty(degree, np.int64)
+    logs = np.empty(degree, np.int64)
+    nterms = 0
+    for i in range(1, degree + 1):
+        if err_loc[i] != 0:
+            terms[nterms] = i
+            logs[nterms] = GF_LOG[err_loc[i]]
+            nterms += 1
+    found = start
+    for c in range(n):
+        acc = err_loc[0]
+        for k in range(nterms):
+            acc ^= GF_EXP[logs[k]]
+            logs[k] -= terms[k]
+            if logs[k] < 0:
+                logs[k] += FIELD_CHARAC
+        if acc == 0:
+            coef_pos[found] = c
+            found += 1
+            # A degree-d locator has at most d roots
+            if found - start == degree:
+                break
+    return found - start
+
+
+@njit(cache=True, nogil=True)
+def forney(cw, synd, nsym, coef_pos, count):
+    """Correct cw in place at the count errata in coef_pos; False if the locator is degenerate."""
+    n = cw.shape[0]
+    # Errata locator prod(1 + X_l x), lowest degree first
+    loc = np.zeros(count + 1, np.uint8)
+    loc[0] = 1
+    for k in range(count):
+        xk = gf_pow_alpha(coef_pos[k])
+        for j in range(k + 1, 0, -1):
+            loc[j] ^= gf_mul(loc[j - 1], xk)
+    # Errata evaluator Omega = S * loc mod x**nsym
+    omega = np.zeros(nsym, np.uint8)
+    for i in range(nsym):
+        acc = 0
+        for j in range(min(i, count) + 1):
+            acc ^= gf_mul(synd[i - j], loc[j])
+        omega[i] = acc
+    for k in range(count):
+        xk = gf_pow_alpha(coef_pos[k])
+        xk_inv = gf_inv(xk)
+        denom = 1
+        for j in range(count):
+            if j != k:
+                denom = gf_mul(denom, 1 ^ gf_mul(xk_inv, gf_pow_alpha(coef_pos[j])))
+        if denom == 0:
+            return False
+        num = 0
+        for i in range(nsym - 1, -1, -1):
+            num = gf_mul(num, xk_inv) ^ omega[i]
+        cw[n - 1 - coef_pos[k]] ^= gf_mul(num, gf_inv(denom))
+    return True
+
+
+@njit(cache=True, nogil=True)
+def rs_decode_block(cw, nsym, erase_pos, only_erasures, err_pos):
+    """
+    Repair one block in place. Erasure positions come first in err_pos,
+    followed by located errors. Returns the errata count, or a negative
+    failure code.
+    """
+    n = cw.shape[0]
+    n_erase = erase_pos.shape[0]
+    if n_erase > nsym:
+        return _TOO_MANY_ERASURES
+    for k in range(n_erase):
+        cw[erase_pos[k]] = 0
+    synd = np.zeros(nsym, np.uint8)
+    if not syndromes(cw, nsym, synd):
+        err_pos[:n_erase] = erase_pos
+        return n_erase
+
+    coef_pos = np.zeros(nsym, np.int64)
+    for k in range(n_erase):
+        coef_pos[k] = n - 1 - erase_pos[k]
+    count = n_erase
+    if not only_erasures:
+        fsynd = np.zeros(nsym, np.uint8)
+        forney_syndromes(synd, coef_pos[:n_erase], nsym, fsynd)
+        err_loc = np.zeros(nsym + 1, np.uint8)
+        degree = berlekamp_massey(fsynd, nsym - n_erase, err_loc)
+        if 2 * degree + n_erase > nsym:
+            return _TOO_MANY_ERRORS
+        found = chien_search(err_loc, degree, n, coef_pos, n_erase)
+        if found != degree:
+            return _CANNOT_LOCATE
+        count += found
+
+    if not forney(cw, synd, nsym, coef_pos, count):
+        return _CANNOT_CORRECT
+    if syndromes(cw, nsym, synd):
+        return _CANNOT_CORRECT
+    for k in range(count):
+        err_pos[k] = n - 1 - coef_pos[k]
+    return count
+
+
+def rs_decode(cw, nsym, erase_pos=None, only_erasures=False):
+    """
+    Decode one block given as a uint8 array.
+    Returns (repaired codeword, errata positions) or raises ReedSolomonError.
+    """
+    out = np.array(cw, dtype=np.uint8)
+    erase = np.asarray(erase_pos if erase_pos else [], dtype=np.int64)
+    err_pos = np.zeros(nsym, np.int64)
+    count = rs_decode_block(out, nsym, erase, only_erasures, err_pos)
+    if count < 0:
+        raise ReedSolomonError(_FAILURES[count])
+    return out, err_pos[:count]
+
+
+@njit(parallel=True, cache=True, nogil=True)
+def rs_encode_batch(msgs, gen, parity):
+    """Encode every row of msgs (left-padded with zeros) into parity[row]."""
+    width = msgs.shape[1]
+    for k in prange(msgs.shape[0]):
+        parity[k] = rs_encode(msgs[k], gen)[width:]
+
+
+@njit(parallel=True, cache=True, nogil=True)
+def rs_decode_batch(cws, pads, nsym, status, err_pos):
+    """
+    Repair every row of cws in place; status[row] is rs_decode_block's result.
+    Only cws[row, pads[row]:] is decoded, so no root is ever located in the padding.
+    """
+    no_erasures = np.zeros(0, np.int64)
+    for k in prange(cws.shape[0]):
+        status[k] = rs_decode_block(cws[k, pads[k]:], nsym, no_erasures, False, err_pos[k])
+
+
+def _pad_rows(blocks, width):
+    """
+    Stack variable-length blocks into a (len(blocks), width) array, padded
+    with leading zeros. Leading zeros do not change a polynomial, so a
+    padded block encodes to the same parity as the original (shortened code).
+    """
+    rows = np.zeros((len(blocks), width), np.uint8)
+    for i, block in enumerate(blocks):
+        rows[i, width - len(block):] = np.frombuffer(block, np.uint8)
+    return rows
+
+
+def _as_uint8(data):
+    """View bytes-like data as a uint8 array without copying; other sequences are converted."""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return np.frombuffer(data, np.uint8)
+    return np.asarray(data, np.uint8)
+
+
+class RSCodec:
+    """Drop-in replacement for the encode/decode half of ``reedsolo.RSCodec``."""
+
+    def __init__(self, nsym=10, nsize=255):
+        if nsym >= nsize:
+            raise ValueError('ECC symbols must be strictly less than the total message length (nsym < nsize).')
+        if nsize > FIELD_CHARAC:
+            raise ValueError("rs_numba only supports GF(2^8) (nsize <= 255)")
+        self.nsym = nsym
+        self.nsize = nsize
+        self.gen = generator_poly(nsym)
+
+    def _check_nsym(self, nsym):
+        """reedsolo allows a per-call nsym; these kernels only support the codec's own."""
+        if nsym and nsym != self.nsym:
+            raise ValueError("rs_numba.RSCodec(%i) cannot encode/decode with nsym=%i" % (self.nsym, nsym))
+
+    def encode(self, data, nsym=None):
+        self._check_nsym(nsym)
+        if isinstance(data, str):
+            data = data.encode("latin-1")
+        msg = _as_uint8(data)
+        enc = bytearray()
+        step = self.nsize - self.nsym
+        for i in range(0, len(msg), step):
+            enc.extend(rs_encode(msg[i:i + step], self.gen).tobytes())
+        return enc
+
+    def decode(self, data, nsym=None, erase_pos=None, only_erasures=False):
+        self._check_nsym(nsym)
+        if isinstance(data, str):
+            data = data.encode("latin-1")
+        cw = _as_uint8(data)
+        nsym = self.nsym
+        dec = bytearray()
+        dec_full = bytearray()
+        errata_pos_all = bytearray()
+        for i in range(0, len(cw), self.nsize):
+            e_pos = [p - i for p in erase_pos if i <= p < i + self.nsize] if erase_pos else None
+            block, errata = rs_decode(cw[i:i + self.nsize], nsym, e_pos, only_erasures)
+            dec.extend(block[:-nsym].tobytes())
+            dec_full.extend(block.tobytes())
+            errata_pos_all.extend(errata.astype(np.uint8).tobytes())
+        return dec, dec_full, errata_pos_all
+
+    def encode_many(self, msgs):
+        """Encode a list of messages; same result as [self.encode(m) for m in msgs]."""
+        step = self.nsize - self.nsym
+        blocks = []
+        counts = []
+        for msg in msgs:
+            msg = bytes(msg)
+            chunks = [msg[i:i + step] for i in range(0, len(msg), step)]
+            blocks.extend(chunks)
+            counts.append(len(chunks))
+        parity = np.empty((len(blocks), self.nsym), np.uint8)
+        rs_encode_batch(_pad_rows(blocks, max(map(len, blocks), default=0)), self.gen, parity)
+
+        out = []
+        k = 0
+        for count in counts:
+            enc = bytearray()
+            for _ in range(count):
+                enc += blocks[k]
+                enc += parity[k].tobytes()
+                k += 1
+            out.append(enc)
+        return out
+
+    def decode_many(self, cws):
+        """
+        Decode a list of codewords (errors only, no erasures); same result as
+        [self.decode(cw) for cw in cws]. Raises ReedSolomonError if any block fails.
+        """
+        nsym = self.nsym
+        blocks = []
+        counts = []
+        for cw in cws:
+            cw = bytes(cw)
+            chunks = [cw[i:i + self.nsize] for i in range(0, len(cw), self.nsize)]
+            blocks.extend(chunks)
+            counts.append(len(chunks))
+        width = max(map(len, blocks), default=0)
+        rows = _pad_rows(blocks, width)
+        pads = np.array([width - len(b) for b in blocks], np.int64)
+        status = np.empty(len(blocks), np.int64)
+        err_pos = np.zeros((len(blocks), nsym), np.int64)
+        rs_decode_batch(rows, pads, nsym, status, err_pos)
+
+        out = []
+        k = 0
+        for count in counts:
+            dec = bytearray()
+            dec_full = bytearray()
+            errata_pos_all = bytearray()
+            for _ in range(count):
+                if status[k] < 0:
+                    raise ReedSolomonError(_FAILURES[status[k]])
+                block = rows[k, pads[k]:]
+                dec.extend(block[:-nsym].tobytes())
+                dec_full.extend(block.tobytes())
+                errata_pos_all.extend(err_pos[k, :status[k]].astype(np.uint8).tobytes())
+                k += 1
+            out.append((dec, dec_full, errata_pos_all))
+        return out
+
+
+# Compile (or load from cache) every kernel now, so the first real
+# encode/decode call does not pay the JIT cost.
+_warm = RSCodec(2)
+_warm.decode(_warm.encode(b"\x00"), erase_pos=[0])
+_warm.decode_many(_warm.encode_many([b"\x00"]))
+del _warm
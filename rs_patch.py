@@ -0,0 +1,118 @@
+"""
+rs_patch.py
+
+Vectorized replacements for hot spots of the pure-Python reedsolo codec.
+
+``install()`` swaps them into the reedsolo module; RSCodec.decode then
+picks them up through its normal global lookups, and the rest of the
+decoder (Berlekamp-Massey, Chien search, Forney) is left untouched.
+"""
+
+import functools
+import textwrap
+import numpy as np
+import reedsolo
+
+
+_rs_calc_syndromes = reedsolo.rs_calc_syndromes
+
+
+@functools.lru_cache(maxsize=16)
+def _syndrome_exponents(nsym: int, n: int, fcr: int, log_generator: int, field_charac: int) -> np.ndarray:
+    """
+    (nsym, n) matrix of log(alpha**(i+fcr)) * (n-1-j) mod field_charac, i.e. the
+    log of the constant that byte j is multiplied by in syndrome i.
+    """
+    roots = (log_generator * (np.arange(nsym, dtype=np.int64) + fcr)) % field_charac
+    degrees = np.arange(n - 1, -1, -1, dtype=np.int64)
+    return (roots[:, None] * degrees[None, :]) % field_charac
+
+
+def rs_calc_syndromes(msg, nsym, fcr=0, generator=2):
+    '''Same result as reedsolo.rs_calc_syndromes, evaluating all syndromes with one NumPy gather + XOR-reduce.'''
+    gf_log = np.asarray(reedsolo.gf_log, dtype=np.int64)
+    gf_exp = np.asarray(reedsolo.gf_exp, dtype=np.int64)
+    field_charac = reedsolo.field_charac
+    cw = np.asarray(msg, dtype=np.int64)
+    nonzero = np.flatnonzero(cw)
+    if nonzero.size == 0:
+        return [0] * (nsym + 1)
+    powers = _syndrome_exponents(nsym, len(cw), fcr, int(gf_log[generator]), field_charac)
+    terms = gf_exp[(gf_log[cw[nonzero]] + powers[:, nonzero]) % field_charac]
+    return [0] + np.bitwise_xor.reduce(terms, axis=1).tolist()
+
+
+@functools.lru_cache(maxsize=16)
+def _parity_lut(gen: bytes, gf_exp: bytes) -> list:
+    """
+    lut[t] packs t * gen[1:] into one big-endian int, i.e. the whole
+    parity-register update for feedback byte t. gf_exp is only part of
+    the cache key, so a codec on another field gets its own table.
+    """
+    return [int.from_bytes(bytes(reedsolo.gf_mul(t, g) for g in gen[1:]), "big") for t in range(256)]
+
+
+def _encode_small_nsym(msg, nsym: int, lut: list) -> bytes:
+    """Parity bytes of msg with the whole LFSR state held in one int (SWAR, nsym <= 8)."""
+    mask = (1 << (8 * nsym)) - 1
+    shift = 8 * (nsym - 1)
+    state = 0
+    for b in msg:
+        state = ((state << 8) & mask) ^ lut[(state >> shift) ^ b]
+    return state.to_bytes(nsym, "big")
+
+
+@functools.lru_cache(maxsize=16)
+def make_encoder(gen: bytes, gf_exp: bytes):
+    """
+    Generate a parity function specialized for one generator polynomial:
+    the register shift for every parity byte is written out as straight-line
+    code, with one multiply-by-gen[i] table per coefficient bound as a local.
+    gf_exp is only part of the cache key (see _parity_lut).
+    """
+    nsym = len(gen) - 1
+    regs = [f"s{i}" for i in range(nsym)]
+    tables = [f"m{i}" for i in range(1, nsym + 1)]
+    updates = [f"{regs[i + 1]} ^ {tables[i]}[t]" for i in range(nsym - 1)] + [f"{tables[-1]}[t]"]
+    src = textwrap.dedent(f"""\
+        def encode(msg, {", ".join(f"{m}={m}" for m in tables)}):
+            {" = ".join(regs)} = 0
+            for b in msg:
+                t = s0 ^ b
+                {", ".join(regs)} = {", ".join(updates)}
+            return bytes(({", ".join(regs)},))
+        """)
+    ns = {m: [reedsolo.gf_mul(t, g) for t in range(256)] for m, g in zip(tables, gen[1:])}
+    exec(compile(src, f"<rs_encoder nsym={nsym}>", "exec"), ns)
+    return ns["encode"]
+
+
+_rs_encode_msg = reedsolo.rs_encode_msg
+
+
+def rs_encode_msg(msg_in, nsym, fcr=0, generator=2, gen=None):
+    '''
+    Same result as reedsolo.rs_encode_msg in GF(2^8): the packed-register
+    encoder for nsym <= 8, a generated straight-line encoder above that.
+    '''
+    if gen is None or reedsolo.field_charac != 255:
+        return _rs_encode_msg(msg_in, nsym, fcr, generator, gen)
+    if (len(msg_in) + nsym) > reedsolo.field_charac:
+        raise ValueError("Message is too long (%i when max is %i)" % (len(msg_in) + nsym, reedsolo.field_charac))
+    # Like reedsolo, the parity length comes from gen: RSCodec.encode(data, nsym=m)
+    # passes self.nsym here together with gen=self.gen[m].
+    nsym = len(gen) - 1
+    msg_out = bytearray(msg_in)
+    if nsym == 0:
+        return msg_out
+    if nsym <= 8:
+        msg_out += _encode_small_nsym(msg_out, nsym, _parity_lut(bytes(gen), bytes(reedsolo.gf_exp)))
+    else:
+        msg_out += make_encoder(bytes(gen), bytes(reedsolo.gf_exp))(msg_out)
+    return msg_out
+
+
+def install():
+    """Patch reedsolo in place. Safe to call more than once."""
+    reedsolo.rs_calc_syndromes = rs_calc_syndromes
+    reedsolo.rs_encode_msg = rs_encode_msg
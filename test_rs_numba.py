@@ -0,0 +1,107 @@
+"""Check rs_numba.RSCodec against reedsolo.RSCodec on random messages."""
+
+import random
+
+import pytest
+import reedsolo
+
+rs_numba = pytest.importorskip("rs_numba")
+
+
+def _random_bytes(rnd, n):
+    return bytes(rnd.randrange(256) for _ in range(n))
+
+
+def _corrupt(rnd, cw, nsym, nsize=255):
+    """Corrupt every block with up to nsym/2 errors plus erasures within the Singleton bound."""
+    cw = bytearray(cw)
+    erase_pos = []
+    for block in range(0, len(cw), nsize):
+        n = min(nsize, len(cw) - block)
+        num_errors = rnd.randint(0, min(n, nsym // 2))
+        num_erasures = rnd.randint(0, min(n - num_errors, nsym - 2 * num_errors))
+        positions = rnd.sample(range(n), num_errors + num_erasures)
+        for pos in positions:
+            cw[block + pos] ^= rnd.randrange(1, 256)
+        erase_pos += sorted(block + pos for pos in positions[num_errors:])
+    return cw, erase_pos
+
+
+@pytest.mark.parametrize("nsym", [2, 4, 8, 10, 16, 32])
+def test_encode_decode_match_reedsolo(nsym):
+    rnd = random.Random(nsym)
+    ref = reedsolo.RSCodec(nsym)
+    rsc = rs_numba.RSCodec(nsym)
+    for _ in range(100):
+        msg = _random_bytes(rnd, rnd.randint(1, 600))  # up to three blocks
+        cw = rsc.encode(msg)
+        assert cw == ref.encode(msg)
+
+        corrupted, erase_pos = _corrupt(rnd, cw, nsym)
+        expected = ref.decode(bytes(corrupted), erase_pos=erase_pos or None)
+        assert expected[0] == msg
+        assert rsc.decode(bytes(corrupted), erase_pos=erase_pos or None) == expected
+
+
+def test_only_erasures():
+    rnd = random.Random(1)
+    ref = reedsolo.RSCodec(12)
+    rsc = rs_numba.RSCodec(12)
+    msg = _random_bytes(rnd, 100)
+    cw = bytearray(rsc.encode(msg))
+    erase_pos = sorted(rnd.sample(range(len(cw)), 12))
+    for pos in erase_pos:
+        cw[pos] ^= 0xFF
+    assert rsc.decode(cw, erase_pos=erase_pos, only_erasures=True) == ref.decode(cw, erase_pos=erase_pos, only_erasures=True)
+
+
+def test_too_many_errors_raises():
+    rsc = rs_numba.RSCodec(4)
+    cw = bytearray(rsc.encode(b"hello world"))
+    with pytest.raises(reedsolo.ReedSolomonError):
+        rsc.decode(cw, erase_pos=[0, 1, 2, 3, 4])
+
+
+def test_nsym_argument():
+    rsc = rs_numba.RSCodec(8)
+    cw = rsc.encode(b"hello", 8)
+    assert rsc.decode(cw, 8, [1]) == reedsolo.RSCodec(8).decode(cw, 8, [1])
+    with pytest.raises(ValueError):
+        rsc.encode(b"hello", 4)
+
+
+@pytest.mark.parametrize("nsym", [2, 8, 16])
+def test_batch_matches_single(nsym):
+    rnd = random.Random(nsym)
+    ref = reedsolo.RSCodec(nsym)
+    rsc = rs_numba.RSCodec(nsym)
+    msgs = [_random_bytes(rnd, rnd.randint(0, 600)) for _ in range(50)]
+    cws = rsc.encode_many(msgs)
+    assert cws == [ref.encode(msg) for msg in msgs]
+
+    corrupted = []
+    for cw in cws:
+        cw = bytearray(cw)
+        for block in range(0, len(cw), 255):
+            n = min(255, len(cw) - block)
+            for pos in rnd.sample(range(n), min(n, nsym // 2)):
+                cw[block + pos] ^= rnd.randrange(1, 256)
+        corrupted.append(bytes(cw))
+    assert rsc.decode_many(corrupted) == [ref.decode(cw) for cw in corrupted]
+
+    # Mixed lengths past capacity: a short, padded codeword with too many errors
+    # must fail exactly like a single decode, never locate a root in the padding.
+    for _ in range(200):
+        msgs = [_random_bytes(rnd, rnd.randint(1, 50)), _random_bytes(rnd, 255 - nsym)]
+        cws = [bytearray(cw) for cw in rsc.encode_many(msgs)]
+        short = cws[0]
+        for pos in rnd.sample(range(len(short)), min(len(short), nsym // 2 + 1 + rnd.randrange(nsym))):
+            short[pos] ^= rnd.randrange(1, 256)
+        cws = [bytes(cw) for cw in cws]
+        try:
+            expected = [rsc.decode(cw) for cw in cws]
+        except reedsolo.ReedSolomonError:
+            with pytest.raises(reedsolo.ReedSolomonError):
+                rsc.decode_many(cws)
+        else:
+            assert rsc.decode_many(cws) == expected
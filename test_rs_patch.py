@@ -0,0 +1,73 @@
+"""Check the rs_patch replacements against the stock reedsolo functions they stand in for."""
+
+import random
+
+import pytest
+import reedsolo
+
+import rs_patch
+
+
+@pytest.fixture
+def patched(monkeypatch):
+    """Install rs_patch for one test only, restoring stock reedsolo afterwards."""
+    monkeypatch.setattr(reedsolo, "rs_calc_syndromes", rs_patch.rs_calc_syndromes)
+    monkeypatch.setattr(reedsolo, "rs_encode_msg", rs_patch.rs_encode_msg)
+
+
+def _random_bytes(rnd, n):
+    return bytes(rnd.randrange(256) for _ in range(n))
+
+
+@pytest.mark.parametrize("nsym", [0, 1, 2, 7, 8, 9, 16, 32, 100])
+def test_encode_matches_reedsolo(nsym):
+    rnd = random.Random(nsym)
+    rsc = reedsolo.RSCodec(nsym)
+    gen = rsc.gen[nsym]
+    for _ in range(20):
+        msg = _random_bytes(rnd, rnd.randint(0, 255 - nsym))
+        assert rs_patch.rs_encode_msg(msg, nsym, gen=gen) == rs_patch._rs_encode_msg(msg, nsym, gen=gen)
+
+
+@pytest.mark.parametrize("nsym, override", [(8, 4), (4, 8), (8, 12), (12, 8), (10, 2)])
+def test_encode_nsym_override(patched, nsym, override):
+    rnd = random.Random(nsym * 100 + override)
+    rsc = reedsolo.RSCodec(nsym, single_gen=False)
+    for _ in range(10):
+        msg = _random_bytes(rnd, rnd.randint(1, 400))
+        expected = bytearray()
+        for i in range(0, len(msg), 255 - nsym):
+            expected += rs_patch._rs_encode_msg(msg[i:i + 255 - nsym], nsym, gen=rsc.gen[override])
+        assert rsc.encode(msg, nsym=override) == expected
+
+
+def test_encode_other_field_falls_back(patched):
+    try:
+        rsc = reedsolo.RSCodec(10, nsize=1000)
+        msg = list(range(300))
+        assert rsc.encode(msg) == rs_patch._rs_encode_msg(msg, 10, generator=rsc.generator, gen=rsc.gen[10])
+    finally:
+        # RSCodec(nsize=1000) switched reedsolo's global tables to GF(2^10).
+        reedsolo.init_tables()
+
+
+@pytest.mark.parametrize("nsym", [2, 8, 32])
+def test_syndromes_match_reedsolo(nsym):
+    rnd = random.Random(nsym)
+    for _ in range(50):
+        msg = bytearray(rnd.randrange(256) if rnd.random() < 0.8 else 0 for _ in range(rnd.randint(nsym + 1, 255)))
+        assert rs_patch.rs_calc_syndromes(msg, nsym) == rs_patch._rs_calc_syndromes(msg, nsym)
+    assert rs_patch.rs_calc_syndromes(bytearray(20), nsym) == [0] * (nsym + 1)
+
+
+def test_decode_with_patch(patched):
+    rnd = random.Random(0)
+    rsc = reedsolo.RSCodec(16)
+    for _ in range(20):
+        msg = _random_bytes(rnd, rnd.randint(1, 500))
+        cw = bytearray(rsc.encode(msg))
+        for block in range(0, len(cw), 255):
+            n = min(255, len(cw) - block)
+            for pos in rnd.sample(range(n), min(n, 8)):
+                cw[block + pos] ^= rnd.randrange(1, 256)
+        assert rsc.decode(cw)[0] == msg